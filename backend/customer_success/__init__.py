@@ -0,0 +1 @@
+"""Intelligent Customer Success Dashboard backend: Flask API and ML models"""
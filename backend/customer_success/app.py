@@ -0,0 +1,416 @@
+from flask import Flask, request, jsonify, render_template, send_from_directory
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+from flask_cors import CORS
+from flask_compress import Compress
+import pandas as pd
+import numpy as np
+import orjson
+import os
+import threading
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import warnings
+warnings.filterwarnings('ignore')
+
+from customer_success.ml_models import ChurnPredictor, HealthScorer, InterventionRecommender, score_all
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, which is much faster than the stdlib encoder
+    
+    Keys are sorted like Flask's default provider, and NumPy values are serialized directly.
+    """
+    
+    options = orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    mimetype = 'application/json'
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=DefaultJSONProvider.default, option=self.options).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        # Same arguments as jsonify(): one value, several values (a list) or keyword arguments (a dict)
+        if args and kwargs:
+            raise TypeError('app.json.response() takes either args or kwargs, not both')
+        obj = args[0] if len(args) == 1 else (args or kwargs or None)
+        
+        # Pass orjson's bytes straight to the response instead of decoding them first
+        return self._app.response_class(
+            orjson.dumps(obj, default=DefaultJSONProvider.default, option=self.options),
+            mimetype=self.mimetype
+        )
+
+app = Flask(__name__, 
+           static_folder='../../frontend',
+           template_folder='../../frontend')
+app.json = OrjsonProvider(app)
+CORS(app, expose_headers=['X-Total-Count'])
+Compress(app)  # gzip the large JSON responses
+
+# Initialize models
+churn_predictor = ChurnPredictor()
+health_scorer = HealthScorer()
+intervention_recommender = InterventionRecommender()
+
+CUSTOMERS_PATH = '../data/customers.csv'
+INTERACTIONS_PATH = '../data/customer_interactions.csv'
+
+# Parsed data keyed by (path, columns), stored with the file's modification time
+_cache = {}
+
+# CSV files whose Parquet copy could not be written, with the CSV's modification time
+_parquet_failures = {}
+
+def _read_csv(csv_path, columns=None, parse_dates=()):
+    """Read (a column subset of) a data CSV with the dtypes its Parquet copy uses"""
+    df = pd.read_csv(csv_path, engine='pyarrow', usecols=columns)
+    if columns is not None:
+        df = df[columns]
+    
+    # Parsed separately: the pyarrow engine leaves a date column as strings if any cell is blank
+    for col in parse_dates:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+    
+    if 'status' in df.columns:
+        df['status'] = df['status'].astype('category')
+    
+    # Store integer columns in the smallest type that holds them (lossless)
+    for col in df.select_dtypes('integer').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
+def convert_to_parquet(csv_path, parse_dates=()):
+    """Write a Parquet copy of a CSV file if it is missing or older than the CSV"""
+    parquet_path = os.path.splitext(csv_path)[0] + '.parquet'
+    if (not os.path.exists(parquet_path)
+            or os.path.getmtime(parquet_path) < os.path.getmtime(csv_path)):
+        df = _read_csv(csv_path, parse_dates=parse_dates)
+        
+        # Write to a temporary file first so concurrent readers never see a partial file;
+        # the name is unique per process and thread
+        tmp_path = f'{parquet_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            df.to_parquet(tmp_path, compression='zstd')
+            os.replace(tmp_path, parquet_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    return parquet_path
+
+def _read_cached(csv_path, columns=None, parse_dates=()):
+    """Read (a column subset of) a data file, re-reading it only when it changes"""
+    try:
+        path = csv_path
+        if _parquet_failures.get(csv_path) != os.path.getmtime(csv_path):
+            try:
+                path = convert_to_parquet(csv_path, parse_dates)
+            except OSError as e:
+                # e.g. a read-only data directory: serve the CSV itself until it changes
+                print(f"Error writing Parquet copy, reading the CSV instead: {e}")
+                _parquet_failures[csv_path] = os.path.getmtime(csv_path)
+        
+        key = (path, tuple(columns) if columns is not None else None)
+        mtime = os.path.getmtime(path)
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        
+        if path == csv_path:
+            df = _read_csv(csv_path, columns, parse_dates)
+        else:
+            # Parquet keeps dtypes and only the requested columns are read
+            df = pd.read_parquet(path, columns=columns, memory_map=True)
+        
+        _cache[key] = (mtime, df)
+        return df
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        return pd.DataFrame()
+
+def load_customers(columns=None):
+    """Load customers, optionally only the given columns"""
+    return _read_cached(CUSTOMERS_PATH, columns, parse_dates=['signup_date'])
+
+def load_interactions(columns=None):
+    """Load customer interactions, optionally only the given columns"""
+    return _read_cached(INTERACTIONS_PATH, columns, parse_dates=['interaction_date'])
+
+# Load and prepare data
+def load_customer_data():
+    """Load customer data from CSV files"""
+    return load_customers(), load_interactions()
+
+def load_customer_lookup():
+    """Load customers indexed by customer_id plus interaction row positions per customer"""
+    customers, interactions = load_customer_data()
+    
+    # Rebuild the lookups only when the underlying frames were reloaded
+    cached = _cache.get('lookup')
+    if cached is None or cached[0] is not customers or cached[1] is not interactions:
+        customers_by_id = customers.set_index('customer_id', drop=False)
+        interaction_groups = interactions.groupby('customer_id').indices
+        cached = (customers, interactions, customers_by_id, interaction_groups)
+        _cache['lookup'] = cached
+    
+    return cached[2], cached[1], cached[3]
+
+def load_customer_arrays():
+    """Load the columns scanned by the analytics endpoints as contiguous NumPy arrays
+    
+    Returns None if there is no customer data.
+    """
+    customers = load_customers(['status', 'churn_risk', 'health_score'])
+    interactions = load_interactions(['interaction_date'])
+    if customers.empty:
+        return None
+    
+    # Rebuild the arrays only when the underlying frames were reloaded
+    cached = _cache.get('arrays')
+    if cached is None or cached[0] is not customers or cached[1] is not interactions:
+        status = customers['status'].astype('category').cat
+        arrays = SimpleNamespace(
+            health=customers['health_score'].to_numpy(dtype=np.float64),
+            churn=customers['churn_risk'].to_numpy(dtype=np.float64),
+            status_codes=status.codes.to_numpy(),
+            status_categories=status.categories,
+            interaction_dates=interactions['interaction_date'].values
+        )
+        cached = (customers, interactions, arrays)
+        _cache['arrays'] = cached
+    
+    return cached[2]
+
+def load_customers_by_month():
+    """Load customers indexed and sorted by signup date, for monthly resampling"""
+    customers = load_customers(['signup_date', 'customer_id', 'churn_risk'])
+    
+    # Rebuild the view only when the underlying frame was reloaded
+    cached = _cache.get('by_month')
+    if cached is None or cached[0] is not customers:
+        cached = (customers, customers.set_index('signup_date').sort_index())
+        _cache['by_month'] = cached
+    
+    return cached[1]
+
+def to_records(df):
+    """Convert a DataFrame to JSON-ready records, keeping dates as YYYY-MM-DD strings"""
+    # Convert whole columns to Python lists, then zip them into row dicts; avoids the
+    # per-value boxing of to_dict('records')
+    columns = [
+        df[col].dt.strftime('%Y-%m-%d').tolist() if pd.api.types.is_datetime64_any_dtype(df[col])
+        else df[col].tolist()
+        for col in df.columns
+    ]
+    cols = df.columns.tolist()
+    return [dict(zip(cols, row)) for row in zip(*columns)]
+
+# Convert the CSV files to Parquet once at startup
+try:
+    convert_to_parquet(CUSTOMERS_PATH, parse_dates=['signup_date'])
+    convert_to_parquet(INTERACTIONS_PATH, parse_dates=['interaction_date'])
+except Exception as e:
+    print(f"Error converting data to Parquet: {e}")
+
+@app.route('/')
+def index():
+    """Serve the main dashboard"""
+    return render_template('index.html')
+
+@app.route('/api/dashboard-stats')
+def dashboard_stats():
+    """Get overall dashboard statistics"""
+    try:
+        arrays = load_customer_arrays()
+        
+        if arrays is None:
+            return jsonify({'error': 'No customer data available'}), 500
+        
+        # Calculate key metrics
+        total_customers = len(arrays.health)
+        
+        # status is categorical, so compare its integer codes against the 'active' code
+        active_customers = 0
+        if 'active' in arrays.status_categories:
+            active_code = arrays.status_categories.get_loc('active')
+            active_customers = int(np.count_nonzero(arrays.status_codes == active_code))
+        
+        churn_risk = int(np.count_nonzero(arrays.churn >= 0.7))
+        avg_health_score = float(np.nanmean(arrays.health))
+        
+        # Recent interactions (dates are parsed at load, so compare the raw datetime64 values)
+        cutoff = np.datetime64(datetime.now() - timedelta(days=30))
+        recent_interactions = int(np.count_nonzero(arrays.interaction_dates >= cutoff))
+        
+        return jsonify({
+            'total_customers': total_customers,
+            'active_customers': active_customers,
+            'churn_risk_customers': churn_risk,
+            'avg_health_score': round(avg_health_score, 2),
+            'recent_interactions': recent_interactions
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/customers')
+def get_customers():
+    """Get a page of customers with their health scores and churn predictions
+    
+    Query parameters: limit (default 100) and offset (default 0). The total number
+    of customers is returned in the X-Total-Count header.
+    """
+    try:
+        customers, _ = load_customer_data()
+        total = {'X-Total-Count': str(len(customers))}
+        
+        # Only the requested page is scored
+        limit = max(request.args.get('limit', 100, type=int), 0)
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        customers = customers.iloc[offset:offset + limit]
+        
+        if customers.empty:
+            return jsonify([]), total
+        
+        # Score the whole table in one batch instead of row by row
+        churn_probs, health_scores, engagement = score_all(
+            customers, churn_predictor, health_scorer, intervention_recommender
+        )
+        
+        # Assign to a copy so the cached frame is left untouched
+        churn_probability = churn_probs.round(3)
+        customers_data = to_records(customers.assign(
+            churn_probability=churn_probability,
+            health_score=[round(score, 2) for score in health_scores.tolist()]
+        ))
+        
+        # Get intervention recommendations for at-risk customers only
+        at_risk = np.flatnonzero(churn_probs > 0.5)
+        recommendations = intervention_recommender.get_recommendations_batch(
+            customers.iloc[at_risk], churn_probability[at_risk], engagement[at_risk]
+        )
+        for i, customer_recommendations in zip(at_risk.tolist(), recommendations):
+            customers_data[i]['recommendations'] = customer_recommendations
+        
+        return jsonify(customers_data), total
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/customer/<int:customer_id>')
+def get_customer(customer_id):
+    """Get detailed information for a specific customer"""
+    try:
+        customers_by_id, interactions, interaction_groups = load_customer_lookup()
+        
+        if customer_id not in customers_by_id.index:
+            return jsonify({'error': 'Customer not found'}), 404
+        
+        customer_data = to_records(customers_by_id.loc[[customer_id]])[0]
+        
+        # Get customer interactions
+        positions = interaction_groups.get(customer_id, np.empty(0, dtype=int))
+        customer_interactions = to_records(interactions.iloc[positions])
+        
+        # Get predictions
+        churn_prob = churn_predictor.predict_churn(customer_data)
+        health_score = health_scorer.calculate_health_score(customer_data)
+        recommendations = intervention_recommender.get_recommendations(customer_data)
+        
+        return jsonify({
+            'customer': customer_data,
+            'interactions': customer_interactions,
+            'churn_probability': round(churn_prob, 3),
+            'health_score': round(health_score, 2),
+            'recommendations': recommendations
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/predict-churn', methods=['POST'])
+def predict_churn():
+    """Predict churn for given customer data"""
+    try:
+        customer_data = request.json
+        churn_prob = churn_predictor.predict_churn(customer_data, reject_missing=True)
+        
+        return jsonify({
+            'churn_probability': round(churn_prob, 3),
+            'risk_level': 'High' if churn_prob > 0.7 else 'Medium' if churn_prob > 0.4 else 'Low'
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/health-score', methods=['POST'])
+def calculate_health():
+    """Calculate customer health score"""
+    try:
+        customer_data = request.json
+        health_score = health_scorer.calculate_health_score(customer_data)
+        
+        return jsonify({
+            'health_score': round(health_score, 2),
+            'health_status': health_scorer.get_health_status(health_score)
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/recommendations', methods=['POST'])
+def get_recommendations():
+    """Get intervention recommendations for a customer"""
+    try:
+        customer_data = request.json
+        recommendations = intervention_recommender.get_recommendations(customer_data)
+        
+        return jsonify({'recommendations': recommendations})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/analytics/churn-trend')
+def churn_trend():
+    """Get churn trend analytics"""
+    try:
+        customers_by_month = load_customers_by_month()
+        
+        # Bin by calendar month and calculate churn rates; months without signups are dropped
+        monthly_data = customers_by_month.resample('MS').agg(
+            count=('customer_id', 'size'),
+            churn=('churn_risk', 'mean')
+        )
+        monthly_data = monthly_data[monthly_data['count'] > 0]
+        
+        return jsonify({
+            'months': monthly_data.index.strftime('%Y-%m').tolist(),
+            'customer_count': monthly_data['count'].tolist(),
+            'churn_rate': (monthly_data['churn'] * 100).round(2).tolist()
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/analytics/health-distribution')
+def health_distribution():
+    """Get health score distribution"""
+    try:
+        arrays = load_customer_arrays()
+        
+        if arrays is None:
+            return jsonify({'error': 'No customer data available'}), 500
+        
+        health = arrays.health
+        
+        # Calculate health score distribution in a single pass: bin i holds scores in [edges[i-1], edges[i])
+        edges = [50, 70, 90]
+        labels = ['Poor (0-49)', 'Fair (50-69)', 'Good (70-89)', 'Excellent (90-100)']
+        counts = np.bincount(np.searchsorted(edges, health[~np.isnan(health)], side='right'),
+                             minlength=len(labels))
+        health_ranges = {label: int(count) for label, count in reversed(list(zip(labels, counts)))}
+        
+        return jsonify(health_ranges)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+if __name__ == '__main__':
+    print("Starting Customer Success Dashboard...")
+    print("Dashboard will be available at: http://localhost:5000")
+    # Development server only; use wsgi.py with gunicorn in production
+    app.run(debug=os.environ.get('FLASK_DEBUG') == '1', port=5000)
\ No newline at end of file
@@ -0,0 +1,640 @@
+import pandas as pd
+import numpy as np
+import os
+import re
+from functools import lru_cache
+from itertools import islice
+from datetime import datetime, timedelta
+
+from customer_success._kernels import customer_health, score_customers
+
+class _ModelUnavailable(Exception):
+    """Raised out of a cached prediction so that a fallback result is never memoized"""
+
+def _as_arrays(customer_data):
+    """Wrap a single customer's values as 1-element arrays, the shape the batch code expects"""
+    return {key: np.array([value]) for key, value in customer_data.items()}
+
+def _feature_key(customer_data, features):
+    """Hashable (feature, value) pairs for the given features present in customer_data"""
+    return tuple((feature, customer_data[feature]) for feature in features if feature in customer_data)
+
+def _call_cached(cached, *key):
+    """Call an lru_cache-wrapped function, bypassing the cache for unhashable keys"""
+    try:
+        hash(key)
+    except TypeError:
+        return cached.__wrapped__(*key)
+    return cached(*key)
+
+def _column_arrays(customers, columns):
+    """Read DataFrame columns into a dict of contiguous float64 arrays"""
+    return {col: np.ascontiguousarray(customers[col].to_numpy(), dtype=np.float64) for col in columns}
+
+def _float_columns(col_arrays, defaults):
+    """Get columns from a mapping of arrays as equal-length float64 arrays
+    
+    Missing columns are filled with their default value.
+    """
+    arrays = np.broadcast_arrays(*(
+        np.atleast_1d(np.asarray(col_arrays.get(name, default), dtype=np.float64))
+        for name, default in defaults.items()
+    ))
+    return [np.ascontiguousarray(array) for array in arrays]
+
+def score_all(customers, churn_predictor, health_scorer, intervention_recommender):
+    """Score churn probability, health score and engagement level for a customer DataFrame
+    
+    The feature columns are read once; with numba the health score, rule-based
+    churn risk and engagement level all come out of a single fused kernel pass.
+    """
+    col_arrays = _column_arrays(customers, churn_predictor.feature_columns)
+    tenure = col_arrays['tenure_months']
+    revenue = col_arrays['monthly_revenue']
+    interactions = col_arrays['total_interactions']
+    tickets = col_arrays['support_tickets']
+    last_login = col_arrays['last_login_days']
+    usage = col_arrays['feature_usage_score']
+    
+    if score_customers is not None:
+        health_scores, rule_churn, engagement = score_customers(
+            tenure, revenue, interactions, last_login, tickets, usage, health_scorer._weight_array()
+        )
+    else:
+        health_scores = health_scorer.calculate_health_score_vec(col_arrays)
+        rule_churn = churn_predictor._rule_based_churn_vec(tenure, revenue, interactions, last_login)
+        engagement = intervention_recommender._engagement_level_vec(interactions, last_login)
+    
+    churn_probs = churn_predictor._predict_proba_batch(churn_predictor.prepare_features(col_arrays))
+    if churn_probs is None:
+        # Fallback rule-based prediction
+        churn_probs = rule_churn
+    
+    return churn_probs, health_scores, engagement
+
+# (model, scaler, onnx_session) once loaded or trained; shared by every ChurnPredictor.
+# sklearn and joblib are only imported at that point, keeping app startup light.
+_MODEL = None
+
+
+class ChurnPredictor:
+    """Machine Learning model for predicting customer churn"""
+    
+    def __init__(self):
+        self.model = None
+        self.scaler = None
+        self._onnx_session = None
+        self._loaded = False  # model is loaded on first prediction
+        self.feature_columns = [
+            'tenure_months', 'monthly_revenue', 'total_interactions',
+            'support_tickets', 'last_login_days', 'feature_usage_score'
+        ]
+        
+        # Predictions for repeated feature values are served from memory
+        self._predict_cached = lru_cache(maxsize=4096)(self._predict_features)
+    
+    def prepare_features(self, col_arrays):
+        """Prepare the feature matrix for prediction from a mapping of column arrays"""
+        return np.column_stack(_float_columns(col_arrays, dict.fromkeys(self.feature_columns, 0)))
+    
+    def train_model(self, data_path='../data/customers.csv'):
+        """Train the churn prediction model"""
+        from sklearn.ensemble import GradientBoostingClassifier
+        from sklearn.model_selection import train_test_split
+        from sklearn.preprocessing import StandardScaler
+        from sklearn.metrics import classification_report
+        import joblib
+        
+        try:
+            # Load training data
+            df = pd.read_csv(data_path)
+            
+            # Prepare features and target
+            X = df[self.feature_columns]
+            y = (df['churn_risk'] > 0.5).astype(int)  # Convert to binary
+            
+            # Split data
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y, test_size=0.2, random_state=42, stratify=y
+            )
+            
+            # Scale features
+            self.scaler = StandardScaler()
+            X_train_scaled = self.scaler.fit_transform(X_train)
+            X_test_scaled = self.scaler.transform(X_test)
+            self._cache_scaler_params()
+            self._predict_cached.cache_clear()
+            
+            # Train model
+            self.model = GradientBoostingClassifier(
+                n_estimators=100,
+                learning_rate=0.1,
+                max_depth=3,
+                random_state=42
+            )
+            self.model.fit(X_train_scaled, y_train)
+            
+            # Evaluate
+            y_pred = self.model.predict(X_test_scaled)
+            print("Churn Prediction Model Performance:")
+            print(classification_report(y_test, y_pred))
+            
+            # Save model
+            os.makedirs('../models', exist_ok=True)
+            joblib.dump(self.model, '../models/churn_model.pkl')
+            joblib.dump(self.scaler, '../models/churn_scaler.pkl')
+            self._export_onnx()
+            
+            return True
+        except Exception as e:
+            print(f"Error training churn model: {e}")
+            return False
+    
+    def load_or_train_model(self):
+        """Load existing model or train new one (once per process)"""
+        global _MODEL
+        self._loaded = True
+        self._predict_cached.cache_clear()
+        if _MODEL is not None:
+            self.model, self.scaler, self._onnx_session = _MODEL
+            if self.model is not None:
+                self._cache_scaler_params()
+            return
+        
+        import joblib
+        try:
+            # Memory-map the model's arrays so preloaded gunicorn workers share the pages
+            self.model = joblib.load('../models/churn_model.pkl', mmap_mode='r')
+            self.scaler = joblib.load('../models/churn_scaler.pkl', mmap_mode='r')
+            self._cache_scaler_params()
+            print("Loaded existing churn prediction model")
+        except:
+            print("Training new churn prediction model...")
+            if not self.train_model():
+                # Fallback to simple rule-based model
+                self.model = None
+                print("Using fallback rule-based churn prediction")
+        
+        if self.model is not None:
+            self._onnx_session = self._load_onnx_session()
+        _MODEL = (self.model, self.scaler, self._onnx_session)
+    
+    def _export_onnx(self):
+        """Export the trained model to ONNX (skipped if skl2onnx is not installed)"""
+        try:
+            from skl2onnx import convert_sklearn
+            from skl2onnx.common.data_types import FloatTensorType
+        except ImportError:
+            return False
+        
+        try:
+            onnx_model = convert_sklearn(
+                self.model,
+                initial_types=[('X', FloatTensorType([None, len(self.feature_columns)]))],
+                options={id(self.model): {'zipmap': False}}  # plain probability matrix output
+            )
+            with open('../models/churn_model.onnx', 'wb') as f:
+                f.write(onnx_model.SerializeToString())
+            return True
+        except Exception as e:
+            print(f"Error exporting churn model to ONNX: {e}")
+            return False
+    
+    def _load_onnx_session(self):
+        """Load the ONNX export of the model for inference (None if onnxruntime is not installed)"""
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            return None
+        
+        try:
+            # (Re-)export if the pickled model is newer than its ONNX copy
+            if (not os.path.exists('../models/churn_model.onnx')
+                    or os.path.getmtime('../models/churn_model.onnx') < os.path.getmtime('../models/churn_model.pkl')):
+                if not self._export_onnx():
+                    return None
+            
+            session = ort.InferenceSession('../models/churn_model.onnx', providers=['CPUExecutionProvider'])
+            print("Using ONNX Runtime for churn prediction")
+            return session
+        except Exception as e:
+            print(f"Error loading ONNX churn model: {e}")
+            return None
+    
+    def _cache_scaler_params(self):
+        """Keep the fitted scaler's parameters as float32 arrays for inline scaling"""
+        self._mean = self.scaler.mean_.astype(np.float32)
+        self._inv_scale = (1.0 / self.scaler.scale_).astype(np.float32)
+    
+    def predict_churn(self, customer_data, reject_missing=False):
+        """Predict churn probability for a customer
+        
+        Missing (None/NaN) feature values are zero-filled as in batch scoring, unless
+        reject_missing is set, which raises ValueError instead (used for request payloads).
+        """
+        features = _feature_key(customer_data, self.feature_columns)
+        if reject_missing:
+            for feature, value in features:
+                if value is None or np.isnan(value):
+                    raise ValueError(f"Missing value for '{feature}'")
+        try:
+            return _call_cached(self._predict_cached, features)
+        except _ModelUnavailable:
+            # Fallback rule-based prediction, computed outside the cache so the model is retried next time
+            return self._rule_based_churn_prediction(dict(features))
+    
+    def _predict_features(self, features):
+        """Model churn probability from a customer's (feature, value) pairs"""
+        churn_probs = self._predict_proba_batch(self.prepare_features(_as_arrays(dict(features))))
+        if churn_probs is None:
+            raise _ModelUnavailable
+        return float(churn_probs[0])
+    
+    def _predict_proba_batch(self, X):
+        """Model churn probabilities for a feature matrix, or None if the model is unavailable"""
+        if not self._loaded:
+            self.load_or_train_model()
+        if self.model is None:
+            return None
+        try:
+            X = np.where(np.isnan(X), 0, X).astype(np.float32)
+            
+            # Same as self.scaler.transform(X), without sklearn's per-call input validation
+            X_scaled = (X - self._mean) * self._inv_scale
+            
+            if self._onnx_session is not None:
+                # Compiled tree ensemble: outputs are (labels, probabilities)
+                probabilities = self._onnx_session.run(None, {'X': X_scaled})[1]
+                return probabilities[:, 1].astype(np.float64)
+            
+            return self.model.predict_proba(X_scaled)[:, 1]
+        except Exception as e:
+            print(f"Error predicting churn: {e}")
+            return None
+    
+    def _rule_based_churn_prediction(self, customer_data):
+        """Fallback rule-based churn prediction"""
+        risk_score = 0.0
+        
+        # Low tenure increases risk
+        tenure = customer_data.get('tenure_months', 0)
+        if tenure < 3:
+            risk_score += 0.3
+        elif tenure < 12:
+            risk_score += 0.1
+        
+        # Low revenue increases risk
+        revenue = customer_data.get('monthly_revenue', 0)
+        if revenue < 50:
+            risk_score += 0.2
+        elif revenue < 100:
+            risk_score += 0.1
+        
+        # Few interactions increase risk
+        interactions = customer_data.get('total_interactions', 0)
+        if interactions < 5:
+            risk_score += 0.2
+        
+        # Recent login activity
+        last_login = customer_data.get('last_login_days', 0)
+        if last_login > 30:
+            risk_score += 0.3
+        elif last_login > 7:
+            risk_score += 0.1
+        
+        return min(risk_score, 1.0)
+    
+    def _rule_based_churn_vec(self, tenure, revenue, interactions, last_login):
+        """Fallback rule-based churn prediction for arrays of customers"""
+        risk_score = np.select([tenure < 3, tenure < 12], [0.3, 0.1], default=0.0)
+        risk_score = risk_score + np.select([revenue < 50, revenue < 100], [0.2, 0.1], default=0.0)
+        risk_score = risk_score + np.where(interactions < 5, 0.2, 0.0)
+        risk_score = risk_score + np.select([last_login > 30, last_login > 7], [0.3, 0.1], default=0.0)
+        return np.minimum(risk_score, 1.0)
+
+class HealthScorer:
+    """Customer health scoring system"""
+    
+    # Values used for missing features
+    FEATURE_DEFAULTS = {
+        'total_interactions': 0,
+        'last_login_days': 30,
+        'feature_usage_score': 0,
+        'support_tickets': 0,
+        'monthly_revenue': 0,
+        'tenure_months': 1
+    }
+    
+    def __init__(self):
+        self.weights = {
+            'engagement': 0.3,
+            'usage': 0.25,
+            'satisfaction': 0.2,
+            'financial': 0.15,
+            'support': 0.1
+        }
+        
+        # Scores for repeated feature values are served from memory
+        # (call self._score_cached.cache_clear() after changing the weights)
+        self._score_cached = lru_cache(maxsize=4096)(self._score_features)
+    
+    def calculate_health_score(self, customer_data):
+        """Calculate overall customer health score (0-100)"""
+        if isinstance(customer_data, pd.DataFrame):
+            return self.calculate_health_score_vec(customer_data)
+        
+        return _call_cached(self._score_cached, _feature_key(customer_data, self.FEATURE_DEFAULTS))
+    
+    def _score_features(self, features):
+        """Health score of a single customer from its (feature, value) pairs"""
+        customer_data = dict(features)
+        # Plain floats for both paths, so a None value raises either way
+        values = {key: float(customer_data.get(key, default)) for key, default in self.FEATURE_DEFAULTS.items()}
+        if customer_health is not None:
+            # Compiled scalar kernel
+            return customer_health(values['tenure_months'], values['monthly_revenue'],
+                                   values['total_interactions'], values['last_login_days'],
+                                   values['support_tickets'], values['feature_usage_score'],
+                                   self._weight_array())
+        
+        # Otherwise single customers go through the vectorized path as a 1-element batch
+        return float(self.calculate_health_score_vec(_as_arrays(values))[0])
+    
+    def calculate_health_score_vec(self, col_arrays):
+        """Calculate health scores (0-100) for a batch of customers from a mapping of column arrays"""
+        interactions, last_login_days, feature_usage, support_tickets, revenue, tenure = _float_columns(
+            col_arrays, self.FEATURE_DEFAULTS
+        )
+        
+        if score_customers is not None:
+            health_scores, _, _ = score_customers(tenure, revenue, interactions, last_login_days,
+                                                  support_tickets, feature_usage, self._weight_array())
+            return health_scores
+        
+        scores = {
+            'engagement': self._engagement_vec(last_login_days, interactions),
+            'usage': self._usage_vec(feature_usage),
+            'satisfaction': self._satisfaction_vec(support_tickets),
+            'financial': self._financial_vec(revenue, tenure),
+            'support': self._support_vec(support_tickets)
+        }
+        
+        # Calculate weighted average
+        health_scores = sum(scores[key] * self.weights[key] for key in scores.keys())
+        
+        return np.clip(health_scores, 0, 100)  # Ensure scores are between 0-100
+    
+    def _weight_array(self):
+        """Component weights as an array, in the order the scoring kernel expects"""
+        return np.array([self.weights[key] for key in
+                         ('engagement', 'usage', 'satisfaction', 'financial', 'support')])
+    
+    def _engagement_vec(self, last_login_days, interactions):
+        """Calculate engagement score based on interactions and login frequency"""
+        # More interactions = higher score
+        interaction_score = np.minimum(interactions * 2, 50)
+        
+        # Recent login = higher score
+        login_score = np.select(
+            [last_login_days <= 1, last_login_days <= 7, last_login_days <= 30],
+            [50, 40, 20],
+            default=0
+        )
+        
+        return interaction_score + login_score
+    
+    def _usage_vec(self, feature_usage):
+        """Calculate usage score based on feature adoption"""
+        return np.minimum(feature_usage * 20, 100)
+    
+    def _satisfaction_vec(self, support_tickets):
+        """Calculate satisfaction score"""
+        # Use support tickets as inverse satisfaction indicator
+        return np.select(
+            [support_tickets == 0, support_tickets <= 2, support_tickets <= 5],
+            [100, 80, 60],
+            default=40
+        )
+    
+    def _financial_vec(self, revenue, tenure):
+        """Calculate financial health score"""
+        # Revenue per month of tenure
+        revenue_score = np.minimum(revenue / 10, 70)  # Max 70 points for revenue
+        
+        # Tenure bonus
+        tenure_bonus = np.minimum(tenure * 2, 30)  # Max 30 points for tenure
+        
+        return revenue_score + tenure_bonus
+    
+    def _support_vec(self, support_tickets):
+        """Calculate support interaction score"""
+        # Fewer support tickets = better health
+        return np.select(
+            [support_tickets == 0, support_tickets <= 1, support_tickets <= 3, support_tickets <= 5],
+            [100, 90, 70, 50],
+            default=30
+        )
+    
+    def get_health_status(self, health_score):
+        """Get health status label"""
+        if health_score >= 90:
+            return "Excellent"
+        elif health_score >= 70:
+            return "Good"
+        elif health_score >= 50:
+            return "Fair"
+        else:
+            return "Poor"
+
+class InterventionRecommender:
+    """AI-powered intervention strategy recommender"""
+    
+    # Keywords that place a recommendation in a category, checked in order
+    CATEGORY_KEYWORDS = (
+        ('Personal Outreach', ('call', 'personal')),
+        ('Product Education', ('training', 'demo')),
+        ('Support Enhancement', ('support', 'technical')),
+        ('Commercial', ('discount', 'upgrade'))
+    )
+    
+    # Customer fields the recommendation rules read
+    RULE_FEATURES = (
+        'churn_risk', 'churn_probability', 'total_interactions', 'last_login_days',
+        'feature_usage_score', 'support_tickets', 'monthly_revenue'
+    )
+    
+    def __init__(self):
+        self.intervention_strategies = {
+            'high_churn_low_engagement': (
+                'Schedule personal check-in call',
+                'Offer product training session',
+                'Provide dedicated customer success manager',
+                'Send personalized onboarding materials'
+            ),
+            'high_churn_low_usage': (
+                'Offer feature demo session',
+                'Provide use case examples',
+                'Schedule product walkthrough',
+                'Send tutorial videos'
+            ),
+            'high_churn_support_issues': (
+                'Priority support queue assignment',
+                'Technical expert consultation',
+                'Product feedback session',
+                'Escalate to development team'
+            ),
+            'low_revenue': (
+                'Discuss upgrade opportunities',
+                'Show ROI calculations',
+                'Offer limited-time discount',
+                'Highlight premium features'
+            ),
+            'engagement_drop': (
+                'Send re-engagement email campaign',
+                'Offer new feature preview',
+                'Schedule product update call',
+                'Provide industry insights'
+            )
+        }
+        
+        self._category_patterns = tuple(
+            (re.compile('|'.join(map(re.escape, keywords))), category)
+            for category, keywords in self.CATEGORY_KEYWORDS
+        )
+        
+        # Prefixes used by get_recommendations, sliced once instead of per call
+        self._top2 = {key: strategies[:2] for key, strategies in self.intervention_strategies.items()}
+        self._top1 = {key: strategies[:1] for key, strategies in self.intervention_strategies.items()}
+        
+        # Categorize every known recommendation once up front
+        self._category_cache = {
+            rec: self._fallback_categorize(rec)
+            for strategies in self.intervention_strategies.values()
+            for rec in strategies
+        }
+        
+        # Recommendations for repeated customer values are served from memory
+        self._recommend_cached = lru_cache(maxsize=4096)(self._recommend)
+    
+    def get_recommendations(self, customer_data, engagement_score=None):
+        """Get personalized intervention recommendations
+        
+        engagement_score can be passed in when it was already computed in batch.
+        """
+        recommendations = _call_cached(self._recommend_cached,
+                                       _feature_key(customer_data, self.RULE_FEATURES), engagement_score)
+        
+        # Copies, so callers can modify them without touching the cache
+        return [dict(rec) for rec in recommendations]
+    
+    def _recommend(self, features, engagement_score):
+        """Recommendations for a customer's (feature, value) pairs"""
+        customer_data = dict(features)
+        churn_risk = customer_data.get('churn_risk', 0)
+        if 'churn_probability' in customer_data:
+            churn_risk = customer_data['churn_probability']
+        
+        low_engagement = low_usage = support_issues = engagement_drop = False
+        
+        # High churn risk customers
+        if churn_risk > 0.7:
+            if engagement_score is None:
+                engagement_score = self._get_engagement_level(customer_data)
+            low_engagement = engagement_score < 50
+            low_usage = customer_data.get('feature_usage_score', 0) < 3
+            support_issues = customer_data.get('support_tickets', 0) > 3
+        
+        # Medium churn risk
+        elif churn_risk > 0.4:
+            engagement_drop = customer_data.get('last_login_days', 0) > 14
+        
+        # Low revenue customers
+        low_revenue = customer_data.get('monthly_revenue', 0) < 100
+        
+        return self._prioritize(self._select_strategies(
+            low_engagement, low_usage, support_issues, engagement_drop, low_revenue
+        ))
+    
+    def get_recommendations_batch(self, col_arrays, churn_probability, engagement_score):
+        """Get recommendations for a batch of customers, same rules as get_recommendations
+        
+        Customers that trigger the same rules share one recommendations list, so
+        treat the returned lists as read-only.
+        """
+        feature_usage, support_tickets, last_login_days, revenue = _float_columns(
+            col_arrays,
+            {'feature_usage_score': 0, 'support_tickets': 0, 'last_login_days': 0, 'monthly_revenue': 0}
+        )
+        
+        high_risk = churn_probability > 0.7
+        medium_risk = ~high_risk & (churn_probability > 0.4)
+        rules = np.column_stack([
+            high_risk & (engagement_score < 50),
+            high_risk & (feature_usage < 3),
+            high_risk & (support_tickets > 3),
+            medium_risk & (last_login_days > 14),
+            revenue < 100
+        ])
+        
+        # Build the recommendations once per distinct combination of rules
+        combinations, combination_index = np.unique(rules, axis=0, return_inverse=True)
+        shared = [self._prioritize(self._select_strategies(*combination))
+                  for combination in combinations.tolist()]
+        return [shared[i] for i in combination_index.tolist()]
+    
+    def _select_strategies(self, low_engagement, low_usage, support_issues, engagement_drop, low_revenue):
+        """Collect the strategies for the rules a customer triggered, in priority order"""
+        recommendations = []
+        if low_engagement:
+            recommendations.extend(self._top2['high_churn_low_engagement'])
+        if low_usage:
+            recommendations.extend(self._top2['high_churn_low_usage'])
+        if support_issues:
+            recommendations.extend(self._top1['high_churn_support_issues'])
+        if engagement_drop:
+            recommendations.extend(self._top2['engagement_drop'])
+        if low_revenue:
+            recommendations.extend(self._top1['low_revenue'])
+        return recommendations
+    
+    def _prioritize(self, recommendations):
+        """Add priority levels to the top 5 recommendations, skipping duplicates"""
+        prioritized_recommendations = []
+        for i, rec in enumerate(islice(dict.fromkeys(recommendations), 5)):
+            priority = 'High' if i < 2 else 'Medium' if i < 4 else 'Low'
+            prioritized_recommendations.append({
+                'action': rec,
+                'priority': priority,
+                'category': self._categorize_recommendation(rec)
+            })
+        
+        return prioritized_recommendations
+    
+    def _get_engagement_level(self, customer_data):
+        """Calculate engagement level"""
+        interactions = customer_data.get('total_interactions', 0)
+        last_login = customer_data.get('last_login_days', 30)
+        
+        engagement_score = interactions * 10
+        if last_login <= 7:
+            engagement_score += 20
+        elif last_login <= 30:
+            engagement_score += 10
+        
+        return engagement_score
+    
+    def _engagement_level_vec(self, interactions, last_login):
+        """Calculate engagement levels for arrays of customers"""
+        return interactions * 10 + np.select([last_login <= 7, last_login <= 30], [20, 10], default=0)
+    
+    def _categorize_recommendation(self, recommendation):
+        """Categorize recommendation type"""
+        return self._category_cache.get(recommendation) or self._fallback_categorize(recommendation)
+    
+    def _fallback_categorize(self, recommendation):
+        """Categorize a recommendation by keyword"""
+        text = recommendation.lower()
+        for pattern, category in self._category_patterns:
+            if pattern.search(text):
+                return category
+        return 'Engagement'
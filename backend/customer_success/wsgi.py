@@ -0,0 +1,12 @@
+"""WSGI entry point for production servers
+
+Run from the backend directory (settings come from gunicorn.conf.py):
+    gunicorn customer_success.wsgi:application
+"""
+from customer_success.app import app, churn_predictor
+
+# The model is otherwise loaded on first request; load it here so the preloaded
+# gunicorn master shares it with every worker
+churn_predictor.load_or_train_model()
+
+application = app
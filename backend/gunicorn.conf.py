@@ -0,0 +1,12 @@
+"""gunicorn settings, picked up automatically when started from the backend directory:
+    gunicorn customer_success.wsgi:application
+"""
+bind = '0.0.0.0:5000'
+worker_class = 'gthread'
+workers = 4
+threads = 8
+
+# Import the app (and load the churn model) once in the master process;
+# forked workers then share those pages copy-on-write instead of each
+# loading their own copy
+preload_app = True
@@ -0,0 +1,56 @@
+"""Shared test fixtures
+
+The Flask client is created once per test session (once per worker when running
+in parallel with pytest-xdist) and the model fixtures are the app's own
+module-level instances, so no model is constructed per test.
+"""
+import os
+import shutil
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture(scope='session')
+def dashboard():
+    """The backend app module"""
+    # The backend resolves its data and model files relative to the working directory.
+    # Changed here rather than at import so pytest has already collected its test paths.
+    os.chdir(TESTS_DIR)
+    from customer_success import app
+    return app
+
+
+@pytest.fixture(scope='session')
+def app_client(dashboard):
+    """Flask test client"""
+    dashboard.app.testing = True
+    return dashboard.app.test_client()
+
+
+@pytest.fixture
+def data_dir(dashboard, tmp_path, monkeypatch):
+    """Point the app at copies of the data files in a temporary directory, with empty caches"""
+    for name in ('CUSTOMERS_PATH', 'INTERACTIONS_PATH'):
+        path = tmp_path / os.path.basename(getattr(dashboard, name))
+        shutil.copy(getattr(dashboard, name), path)
+        monkeypatch.setattr(dashboard, name, str(path))
+    monkeypatch.setattr(dashboard, '_cache', {})
+    monkeypatch.setattr(dashboard, '_parquet_failures', {})
+    return tmp_path
+
+
+@pytest.fixture(scope='session')
+def churn_predictor(dashboard):
+    return dashboard.churn_predictor
+
+
+@pytest.fixture(scope='session')
+def health_scorer(dashboard):
+    return dashboard.health_scorer
+
+
+@pytest.fixture(scope='session')
+def intervention_recommender(dashboard):
+    return dashboard.intervention_recommender